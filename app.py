@@ -1,36 +1,96 @@
 import os
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider, JSONProvider
 from flask_cors import CORS
-from datetime import datetime
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+from werkzeug.middleware.proxy_fix import ProxyFix
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
-from sqlalchemy import or_, literal
+from sqlalchemy import and_, or_, case, column, select, values, lambda_stmt
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from concurrent.futures import ThreadPoolExecutor
-import unicodedata
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlencode
+import requests
+import atexit
+import uuid
 import logging
-import json as json_lib
+import logging.handlers
+import queue
+import orjson
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('wedding_api.log')
-    ]
+# Request threads only enqueue records; a single listener thread does the
+# console/file I/O. INFO/DEBUG file writes are buffered and flushed every 100
+# records; WARNING and above (duplicates, 429s, errors) flush immediately.
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+console_handler = logging.StreamHandler()
+console_handler.setFormatter(log_formatter)
+file_handler = logging.FileHandler('wedding_api.log', delay=True)
+file_handler.setFormatter(log_formatter)
+buffered_file_handler = logging.handlers.MemoryHandler(
+    capacity=100,
+    flushLevel=logging.WARNING,
+    target=file_handler
 )
+
+log_queue_handler = logging.handlers.QueueHandler(queue.Queue(-1))
+logging.getLogger().setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+logging.getLogger().addHandler(log_queue_handler)
+
+def start_log_listener():
+    """Start the background thread that writes queued log records"""
+    global log_listener
+    log_listener = logging.handlers.QueueListener(log_queue_handler.queue, console_handler, buffered_file_handler)
+    log_listener.start()
+
+def restart_log_listener_after_fork():
+    """The listener thread does not survive fork (gunicorn preload_app): give the
+    child its own queue, since records queued before the fork belong to the parent"""
+    log_queue_handler.queue = queue.Queue(-1)
+    start_log_listener()
+
+start_log_listener()
+os.register_at_fork(before=buffered_file_handler.flush, after_in_child=restart_log_listener_after_fork)
+# Drain queued records on exit; logging.shutdown() then flushes the file buffer
+atexit.register(lambda: log_listener.stop())
+
 logger = logging.getLogger(__name__)
 
 SHEETS_SYNC_WORKERS = int(os.environ.get('SHEETS_SYNC_WORKERS', 2))
 sheets_executor = ThreadPoolExecutor(max_workers=max(1, SHEETS_SYNC_WORKERS))
+# Drain pending Google Sheets syncs before the process exits
+atexit.register(sheets_executor.shutdown, wait=True)
 
 db = SQLAlchemy()
 migrate = Migrate()
 
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson (serializes datetimes natively)"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=DefaultJSONProvider.default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+# Trust X-Forwarded-For from the platform proxy (Railway) so remote_addr is the client IP
+app.wsgi_app = ProxyFix(app.wsgi_app, x_for=int(os.environ.get('TRUSTED_PROXY_COUNT', 1)))
 CORS(app)
 
+# Per-client rate limiting; use a shared backend (e.g. redis://...) with multiple workers
+app.config['RATELIMIT_ENABLED'] = os.environ.get('RATELIMIT_ENABLED', 'true').lower() != 'false'
+limiter = Limiter(
+    get_remote_address,
+    app=app,
+    storage_uri=os.environ.get('RATELIMIT_STORAGE_URI', 'memory://')
+)
+
 # Database configuration
 DATABASE_URL = os.environ.get('DATABASE_URL')
 if DATABASE_URL and DATABASE_URL.startswith('postgres://'):
@@ -38,6 +98,15 @@ if DATABASE_URL and DATABASE_URL.startswith('postgres://'):
 
 if DATABASE_URL:
     app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
+    # Connection pool per process: sized for the worker's request threads,
+    # pre-ping/recycle to survive Postgres idle timeouts, fail fast when exhausted
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 5)),
+        'pool_pre_ping': True,
+        'pool_recycle': 1800,
+    }
 else:
     logger.warning("⚠️  DATABASE_URL not set - defaulting to in-memory SQLite (data will not persist)")
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
@@ -47,37 +116,33 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db.init_app(app)
 migrate.init_app(app, db)
 
+REQUIRED_FIELDS = ['nombre', 'apellidos', 'asistencia', 'acompanado']
+BULK_MAX_GUESTS = int(os.environ.get('BULK_MAX_GUESTS', 20))
+
 # Google Sheets configuration
 GOOGLE_APPS_SCRIPT_URL = os.environ.get('GOOGLE_APPS_SCRIPT_URL')
-
-def run_migrations_on_startup():
-    if not DATABASE_URL:
-        logger.warning("⚠️  DATABASE_URL not set - cannot run migrations")
-        return
-
-    from flask_migrate import upgrade as migrate_upgrade
-
-    try:
-        with app.app_context():
-            logger.info("Running database migrations...")
-            migrate_upgrade()
-            logger.info("✓ Database migrations applied")
-    except Exception as e:
-        logger.error(f"✗ Failed to run database migrations: {str(e)}", exc_info=True)
-
-def normalize_name(name):
+# Only enable once the deployed script handles the `guests` parameter (see google-sheets-integration.md)
+GOOGLE_APPS_SCRIPT_BATCH = os.environ.get('GOOGLE_APPS_SCRIPT_BATCH', 'false').lower() == 'true'
+
+# Shared HTTP session so Apps Script calls reuse pooled keep-alive connections
+sheets_session = requests.Session()
+sheets_session.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+))
+SHEETS_HEADERS = {'Content-Type': 'application/x-www-form-urlencoded'}
+
+def normalized_name_sql(name):
     """
-    Normalize a name for comparison by:
+    SQL expression normalizing a name for comparison by:
     - Converting to lowercase
-    - Removing accents/diacritics (tildes)
+    - Removing accents/diacritics (unaccent also folds ß, Ł, Ø, Æ...)
     - Stripping whitespace
+    The unique index uses this same expression, so stored names and request
+    input are always normalized identically (immutable_unaccent() is created by migration)
     """
-    # Remove accents using unicode normalization
-    # NFD = Canonical Decomposition, then filter out combining characters
-    nfd = unicodedata.normalize('NFD', name)
-    without_accents = ''.join(char for char in nfd if unicodedata.category(char) != 'Mn')
-    # Convert to lowercase and strip whitespace
-    return without_accents.lower().strip()
+    return db.func.lower(db.func.immutable_unaccent(db.func.trim(name)))
 
 class Guest(db.Model):
     __tablename__ = 'guests'
@@ -85,8 +150,6 @@ class Guest(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     nombre = db.Column(db.String(255), nullable=False)
     apellidos = db.Column(db.String(255), nullable=False)
-    nombre_normalized = db.Column(db.String(255), nullable=False)
-    apellidos_normalized = db.Column(db.String(255), nullable=False)
     asistencia = db.Column(db.String(50), nullable=False)
     acompanado = db.Column(db.String(10), nullable=False)
     adultos = db.Column(db.Integer, nullable=False, default=0, server_default='0')
@@ -97,56 +160,59 @@ class Guest(db.Model):
     created_at = db.Column(db.DateTime, server_default=db.func.now())
     updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
 
+    # Normalized names are SQL expressions, not stored columns; they match the
+    # expression indexes below. immutable_unaccent() is created by migration.
+    nombre_normalized = db.column_property(normalized_name_sql(nombre))
+    apellidos_normalized = db.column_property(normalized_name_sql(apellidos))
+
     __table_args__ = (
-        db.UniqueConstraint('nombre_normalized', 'apellidos_normalized', name='uix_guests_normalized_names'),
+        db.Index(
+            'uix_guests_normalized_names',
+            nombre_normalized.expression,
+            apellidos_normalized.expression,
+            unique=True
+        ),
+        # text_pattern_ops lets Postgres use the index for `LIKE 'prefix %'` lookups
+        db.Index(
+            'ix_guests_apellidos_pattern',
+            apellidos_normalized.expression.label('apellidos_normalized'),
+            postgresql_ops={'apellidos_normalized': 'text_pattern_ops'}
+        ),
     )
 
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'nombre': self.nombre,
-            'apellidos': self.apellidos,
-            'nombre_normalized': self.nombre_normalized,
-            'apellidos_normalized': self.apellidos_normalized,
-            'asistencia': self.asistencia,
-            'acompanado': self.acompanado,
-            'adultos': self.adultos,
-            'ninos': self.ninos,
-            'autobus': self.autobus,
-            'alergias': self.alergias,
-            'comentarios': self.comentarios,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-        }
+def build_sheets_params(guest_data):
+    """Build the Apps Script fields for a guest (same format as the frontend was sending)"""
+    params = {
+        'nombre': f"{guest_data['nombre']} {guest_data['apellidos']}",
+        'asistencia': guest_data['asistencia'],
+        'acompanado': guest_data['acompanado'],
+        'adultos': guest_data['adultos'],
+        'ninos': guest_data['ninos'],
+        'autobus': guest_data['autobus'],
+        'alergias': guest_data['alergias'],
+        'comentarios': guest_data['comentarios']
+    }
+    # Omit null fields (as requests did) so urlencode doesn't send the text "None";
+    # the Apps Script falls back to its defaults for missing fields
+    return {key: value for key, value in params.items() if value is not None}
 
 def add_to_google_sheets_via_script(guest_data):
     """Add guest data to Google Sheets via Google Apps Script"""
-    import requests
-    from urllib.parse import urlencode
-    
     if not GOOGLE_APPS_SCRIPT_URL:
         logger.warning("Google Apps Script URL not configured - skipping sheets sync")
         return False
     
     try:
-        # Prepare data in the same format as the frontend was sending
-        full_name = f"{guest_data['nombre']} {guest_data['apellidos']}"
-        params = {
-            'nombre': full_name,
-            'asistencia': guest_data['asistencia'],
-            'acompanado': guest_data['acompanado'],
-            'adultos': guest_data['adultos'],
-            'ninos': guest_data['ninos'],
-            'autobus': guest_data['autobus'],
-            'alergias': guest_data['alergias'],
-            'comentarios': guest_data['comentarios']
-        }
+        params = build_sheets_params(guest_data)
+        full_name = params['nombre']
         
         logger.info(f"Syncing to Google Sheets - Guest: {full_name}")
-        logger.debug(f"Google Sheets params: {params}")
+        logger.debug("Google Sheets params: %s", params)
         
         # Send to Google Apps Script (same as frontend was doing)
-        response = requests.post(GOOGLE_APPS_SCRIPT_URL, data=params, timeout=10)
+        # Pre-encode the form body so requests sends it as-is
+        body = urlencode(params).encode('utf-8')
+        response = sheets_session.post(GOOGLE_APPS_SCRIPT_URL, data=body, headers=SHEETS_HEADERS, timeout=10)
         
         logger.info(f"Google Sheets response - Status: {response.status_code}, Body: {response.text[:200]}")
         
@@ -161,6 +227,39 @@ def add_to_google_sheets_via_script(guest_data):
         logger.error(f"✗ Exception adding to Google Sheets: {str(e)}", exc_info=True)
         return False
 
+def add_guests_to_google_sheets_via_script(guests_data):
+    """Add several guests to Google Sheets in a single Google Apps Script call"""
+    if not GOOGLE_APPS_SCRIPT_URL:
+        logger.warning("Google Apps Script URL not configured - skipping sheets sync")
+        return False
+    
+    try:
+        # The Apps Script appends one row per element of the `guests` JSON array
+        guests_params = [build_sheets_params(guest_data) for guest_data in guests_data]
+        body = urlencode({'guests': orjson.dumps(guests_params).decode()}).encode('utf-8')
+        
+        logger.info(f"Syncing {len(guests_params)} guests to Google Sheets (batch)")
+        response = sheets_session.post(GOOGLE_APPS_SCRIPT_URL, data=body, headers=SHEETS_HEADERS, timeout=10)
+        
+        logger.info(f"Google Sheets response - Status: {response.status_code}, Body: {response.text[:200]}")
+        
+        try:
+            result = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            result = None
+        if response.status_code == 200 and isinstance(result, dict) and result.get('success') is True and result.get('count') == len(guests_params):
+            logger.info(f"✓ Successfully synced {len(guests_params)} guests to Google Sheets")
+            return True
+        
+        # Some rows may already have been appended, so the batch is not resent
+        guest_names = ', '.join(params['nombre'] for params in guests_params)
+        logger.error(f"✗ Error syncing batch to Google Sheets (not retried, check the sheet for: {guest_names}) - Status: {response.status_code}, Response: {response.text}")
+        return False
+            
+    except Exception as e:
+        logger.error(f"✗ Exception adding batch to Google Sheets: {str(e)}", exc_info=True)
+        return False
+
 def add_to_google_sheets(guest_data):
     """Add guest data to Google Sheets via Google Apps Script"""
     return add_to_google_sheets_via_script(guest_data)
@@ -179,102 +278,229 @@ def enqueue_google_sheets_sync(guest_data):
     future.add_done_callback(_log_result)
     logger.info(f"Queued Google Sheets sync for {guest_data['nombre']} {guest_data['apellidos']} (async)")
 
+def enqueue_google_sheets_batch_sync(guests_data):
+    """
+    Submit a batched Google Sheets synchronization to a background thread.
+    Without GOOGLE_APPS_SCRIPT_BATCH each guest is synced on its own, since a
+    script without batch support would append a single empty row.
+    """
+    if not GOOGLE_APPS_SCRIPT_BATCH:
+        for guest_data in guests_data:
+            enqueue_google_sheets_sync(guest_data)
+        return
+
+    def _log_result(future):
+        try:
+            success = future.result()
+            status = "✓" if success else "✗"
+            logger.info(f"Google Sheets async batch sync completed {status} for {len(guests_data)} guests")
+        except Exception as exc:
+            logger.error(f"✗ Google Sheets async batch sync crashed: {exc}", exc_info=True)
+
+    future = sheets_executor.submit(add_guests_to_google_sheets_via_script, [guest_data.copy() for guest_data in guests_data])
+    future.add_done_callback(_log_result)
+    logger.info(f"Queued Google Sheets batch sync for {len(guests_data)} guests (async)")
+
+def find_missing_field(data):
+    """Return the first required field missing from the request data, if any"""
+    for field in REQUIRED_FIELDS:
+        if field not in data or not data[field]:
+            return field
+    return None
+
+def find_invalid_number_field(data):
+    """Return the first numeric field (adultos, ninos) that is not an integer, if any"""
+    for field in ('adultos', 'ninos'):
+        try:
+            int(data.get(field, 0))
+        except (TypeError, ValueError):
+            return field
+    return None
+
+def build_guest_data(data):
+    """Build the guest record from validated request data"""
+    return {
+        'nombre': data['nombre'].strip(),
+        'apellidos': data['apellidos'].strip(),
+        'asistencia': data['asistencia'],
+        'acompanado': data['acompanado'],
+        'adultos': int(data.get('adultos', 0)),
+        'ninos': int(data.get('ninos', 0)),
+        'autobus': data.get('autobus', 'no'),
+        'alergias': data.get('alergias', ''),
+        'comentarios': data.get('comentarios', '')
+    }
+
+def partial_last_names_match(last_names_normalized):
+    """
+    Condition matching guests whose normalized last names equal, extend or are
+    extended by the first last name of `last_names_normalized` (Spanish naming
+    convention, e.g. "garcia" vs "garcia lopez"). Also covers exact matches.
+    """
+    first_last_name = db.func.split_part(last_names_normalized, ' ', 1)
+    return or_(
+        Guest.apellidos_normalized == first_last_name,
+        # `||` (immutable, unlike concat()) keeps the pattern a plan-time constant
+        # so Postgres can use ix_guests_apellidos_pattern
+        Guest.apellidos_normalized.like(first_last_name.op('||')(' %')),
+        last_names_normalized.like(db.func.concat(Guest.apellidos_normalized, ' %'))
+    )
+
+def last_names_partially_match(last_names_normalized, other_last_names_normalized):
+    """
+    Python counterpart of partial_last_names_match() for two already normalized
+    last names (used to compare guests within the same bulk request)
+    """
+    first_last_name = last_names_normalized.split(' ')[0]
+    return (
+        other_last_names_normalized == first_last_name
+        or other_last_names_normalized.startswith(first_last_name + ' ')
+        or last_names_normalized.startswith(other_last_names_normalized + ' ')
+    )
+
+def find_duplicate_guest(nombre, apellidos):
+    """
+    Find an existing guest with the same first name and matching last names:
+    - Exact match
+    - Partial last names match (Spanish naming convention)
+    Names are normalized by the database. Exact matches are returned first
+    (flagged by `exact_match`); returns None when there is no match.
+    """
+    # Select only the columns needed for the response (plain row, no ORM object).
+    # lambda_stmt caches the compiled SQL; closure variables become bound parameters.
+    return db.session.execute(lambda_stmt(
+        lambda: select(
+            Guest.id,
+            Guest.nombre,
+            Guest.apellidos,
+            Guest.apellidos_normalized.label('apellidos_normalized'),
+            (Guest.apellidos_normalized == normalized_name_sql(apellidos)).label('exact_match')
+        )
+        .where(Guest.nombre_normalized == normalized_name_sql(nombre))
+        .where(partial_last_names_match(normalized_name_sql(apellidos)))
+        # Prefer an exact match so it gets the more specific error message
+        .order_by(case((Guest.apellidos_normalized == normalized_name_sql(apellidos), 0), else_=1))
+        .limit(1)
+    )).first()
+
+def find_duplicate_guests(guests_data):
+    """
+    Batch version of find_duplicate_guest(), using a single query for all guests.
+    Returns one row per guest, in order, with its normalized names and the best
+    existing match (`id` is None when there is no match).
+    """
+    candidates = values(
+        column('idx', db.Integer),
+        column('nombre', db.String),
+        column('apellidos', db.String),
+        name='candidates'
+    ).data([
+        (index, guest_data['nombre'], guest_data['apellidos'])
+        for index, guest_data in enumerate(guests_data)
+    ]).cte()
+    nombre_normalized = normalized_name_sql(candidates.c.nombre)
+    apellidos_normalized = normalized_name_sql(candidates.c.apellidos)
+    exact_match = Guest.apellidos_normalized == apellidos_normalized
+
+    rows = db.session.execute(
+        select(
+            candidates.c.idx,
+            nombre_normalized.label('nombre_normalized'),
+            apellidos_normalized.label('apellidos_normalized'),
+            Guest.id,
+            Guest.nombre,
+            Guest.apellidos,
+            exact_match.label('exact_match')
+        )
+        .select_from(candidates)
+        .outerjoin(Guest, and_(
+            Guest.nombre_normalized == nombre_normalized,
+            partial_last_names_match(apellidos_normalized)
+        ))
+        # Prefer an exact match, as in find_duplicate_guest()
+        .order_by(candidates.c.idx, case((exact_match, 0), else_=1))
+    )
+
+    # Keep the first (best) row for each guest
+    best_matches = {}
+    for row in rows:
+        best_matches.setdefault(row.idx, row)
+    return [best_matches[index] for index in range(len(guests_data))]
+
+@app.before_request
+def assign_request_id():
+    """Tag the request with a short random ID used to correlate its log lines"""
+    g.request_id = uuid.uuid4().hex[:12]
+
+@app.errorhandler(429)
+def rate_limit_exceeded(e):
+    """Return rate limit errors as JSON like the rest of the API"""
+    logger.warning(f"✗ Rate limit exceeded - {request.method} {request.path} from {request.remote_addr}: {e.description}")
+    return jsonify({
+        'error': 'Demasiadas solicitudes. Por favor, espera un momento e inténtalo de nuevo.'
+    }), 429
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
     return jsonify({'status': 'healthy'}), 200
 
 @app.route('/api/guests', methods=['POST'])
+@limiter.limit("5 per minute;20 per hour")
 def create_guest():
     """
     Create a new guest RSVP
     Validates uniqueness, stores in PostgreSQL, and syncs to Google Sheets
     """
-    request_id = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    request_id = g.request_id
     logger.info(f"[{request_id}] ========== NEW GUEST REQUEST ==========")
-    logger.info(f"[{request_id}] Method: {request.method}, Path: {request.path}")
-    logger.info(f"[{request_id}] Remote Address: {request.remote_addr}")
-    logger.info(f"[{request_id}] User Agent: {request.headers.get('User-Agent', 'Unknown')}")
+    logger.debug("[%s] Method: %s, Path: %s", request_id, request.method, request.path)
+    logger.debug("[%s] Remote Address: %s", request_id, request.remote_addr)
+    logger.debug("[%s] User Agent: %s", request_id, request.headers.get('User-Agent', 'Unknown'))
     
     try:
         data = request.get_json() if request.is_json else request.form.to_dict()
-        logger.info(f"[{request_id}] Request Data: {json_lib.dumps(data, ensure_ascii=False)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[%s] Request Data: %s", request_id, orjson.dumps(data).decode())
         
         # Validate required fields
-        required_fields = ['nombre', 'apellidos', 'asistencia', 'acompanado']
-        for field in required_fields:
-            if field not in data or not data[field]:
-                logger.warning(f"[{request_id}] ✗ Validation failed - Missing field: {field}")
-                return jsonify({
-                    'error': f'Missing required field: {field}'
-                }), 400
+        missing_field = find_missing_field(data)
+        if missing_field:
+            logger.warning(f"[{request_id}] ✗ Validation failed - Missing field: {missing_field}")
+            return jsonify({
+                'error': f'Missing required field: {missing_field}'
+            }), 400
         
         # Prepare guest data
-        guest_data = {
-            'nombre': data['nombre'].strip(),
-            'apellidos': data['apellidos'].strip(),
-            'asistencia': data['asistencia'],
-            'acompanado': data['acompanado'],
-            'adultos': int(data.get('adultos', 0)),
-            'ninos': int(data.get('ninos', 0)),
-            'autobus': data.get('autobus', 'no'),
-            'alergias': data.get('alergias', ''),
-            'comentarios': data.get('comentarios', '')
-        }
-        
-        # Normalize names for storage and comparison
-        first_name_normalized = normalize_name(guest_data['nombre'])
-        last_names_normalized = normalize_name(guest_data['apellidos'])
+        guest_data = build_guest_data(data)
         
         logger.info(f"[{request_id}] Guest: {guest_data['nombre']} {guest_data['apellidos']}")
-        logger.info(f"[{request_id}] Normalized: {first_name_normalized} {last_names_normalized}")
-        logger.info(f"[{request_id}] Attendance: {guest_data['asistencia']}, Companions: {guest_data['acompanado']}")
+        logger.debug("[%s] Attendance: %s, Companions: %s", request_id, guest_data['asistencia'], guest_data['acompanado'])
         
-        # Check if guest already exists with multiple strategies
-        logger.debug(f"[{request_id}] Checking for duplicate...")
+        # Check for partial last names match (Spanish naming convention).
+        # Exact duplicates are enforced by the unique constraint on INSERT; the
+        # partial filters below also cover them, so they still get the specific message.
+        logger.debug("[%s] Checking for duplicate...", request_id)
 
-        existing_guest = Guest.query.filter_by(
-            nombre_normalized=first_name_normalized,
-            apellidos_normalized=last_names_normalized
-        ).first()
+        existing_guest = find_duplicate_guest(guest_data['nombre'], guest_data['apellidos'])
 
-        if existing_guest:
+        if existing_guest and existing_guest.exact_match:
             logger.warning(f"[{request_id}] ✗ DUPLICATE DETECTED (exact match) - Guest already exists: {existing_guest.nombre} {existing_guest.apellidos} (ID: {existing_guest.id})")
             return jsonify({
                 'error': 'Este nombre ya ha sido registrado. Si necesitas actualizar tu confirmación, por favor contacta con los novios.'
             }), 409
 
-        # Strategy 2: Check for partial last names match (Spanish naming convention)
-        potential_duplicate = None
-        last_names_parts = last_names_normalized.split()
-        if last_names_parts:
-            first_last_name = last_names_parts[0]
-            potential_duplicate = (
-                Guest.query
-                .filter(Guest.nombre_normalized == first_name_normalized)
-                .filter(
-                    or_(
-                        Guest.apellidos_normalized == first_last_name,
-                        Guest.apellidos_normalized.like(f"{first_last_name} %"),
-                        literal(last_names_normalized).like(db.func.concat(Guest.apellidos_normalized, ' %'))
-                    )
-                )
-                .first()
-            )
-
-        if potential_duplicate:
+        if existing_guest:
             logger.warning(f"[{request_id}] ✗ POTENTIAL DUPLICATE DETECTED (partial last names match)")
-            logger.warning(f"[{request_id}]   New: {guest_data['nombre']} {guest_data['apellidos']} (normalized: {first_name_normalized} {last_names_normalized})")
-            logger.warning(f"[{request_id}]   Existing: {potential_duplicate.nombre} {potential_duplicate.apellidos} (ID: {potential_duplicate.id}, normalized: {potential_duplicate.apellidos_normalized})")
+            logger.warning(f"[{request_id}]   New: {guest_data['nombre']} {guest_data['apellidos']}")
+            logger.warning(f"[{request_id}]   Existing: {existing_guest.nombre} {existing_guest.apellidos} (ID: {existing_guest.id}, normalized: {existing_guest.apellidos_normalized})")
             return jsonify({
-                'error': f'Posible duplicado detectado. Ya existe un registro similar: "{potential_duplicate.nombre} {potential_duplicate.apellidos}". Si eres una persona diferente o necesitas actualizar tu confirmación, por favor contacta con los novios.'
+                'error': f'Posible duplicado detectado. Ya existe un registro similar: "{existing_guest.nombre} {existing_guest.apellidos}". Si eres una persona diferente o necesitas actualizar tu confirmación, por favor contacta con los novios.'
             }), 409
 
         new_guest = Guest(
             nombre=guest_data['nombre'],
             apellidos=guest_data['apellidos'],
-            nombre_normalized=first_name_normalized,
-            apellidos_normalized=last_names_normalized,
             asistencia=guest_data['asistencia'],
             acompanado=guest_data['acompanado'],
             adultos=guest_data['adultos'],
@@ -298,7 +524,7 @@ def create_guest():
         logger.info(f"[{request_id}] ✓ Guest saved to database - ID: {new_guest.id}")
         
         # Add to Google Sheets asynchronously (non-blocking)
-        logger.info(f"[{request_id}] Queuing Google Sheets sync (async)...")
+        logger.debug("[%s] Queuing Google Sheets sync (async)...", request_id)
         enqueue_google_sheets_sync(guest_data)
         
         response_data = {
@@ -308,12 +534,14 @@ def create_guest():
                 'id': new_guest.id,
                 'nombre': new_guest.nombre,
                 'apellidos': new_guest.apellidos,
-                'created_at': new_guest.created_at.isoformat() if new_guest.created_at else None
+                'created_at': new_guest.created_at
             },
             'synced_to_sheets': 'pending'
         }
         
-        logger.info(f"[{request_id}] ✓ SUCCESS - Response: {json_lib.dumps(response_data, ensure_ascii=False)}")
+        logger.info("[%s] ✓ SUCCESS - Guest ID: %s", request_id, new_guest.id)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[%s] Response: %s", request_id, orjson.dumps(response_data).decode())
         logger.info(f"[{request_id}] ========================================")
         
         return jsonify(response_data), 201
@@ -326,26 +554,182 @@ def create_guest():
             'error': 'Error al procesar la confirmación. Por favor, inténtalo de nuevo.'
         }), 500
 
-@app.route('/api/guests', methods=['GET'])
-def get_guests():
-    """Get all guests (optional endpoint for admin purposes)"""
-    request_id = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
-    logger.info(f"[{request_id}] GET /api/guests - Fetching all guests")
-    logger.info(f"[{request_id}] Remote Address: {request.remote_addr}")
+@app.route('/api/guests/bulk', methods=['POST'])
+@limiter.limit("5 per minute;20 per hour")
+def create_guests_bulk():
+    """
+    Create several guest RSVPs at once (e.g. a whole family)
+    Guests that already exist are skipped; the rest are stored with a single
+    INSERT and synced to Google Sheets (in one batched call with GOOGLE_APPS_SCRIPT_BATCH)
+    """
+    request_id = g.request_id
+    logger.info(f"[{request_id}] ========== NEW BULK GUEST REQUEST ==========")
+    logger.debug("[%s] Remote Address: %s", request_id, request.remote_addr)
     
     try:
-        guests = Guest.query.order_by(Guest.created_at.desc()).all()
-        guests_payload = [guest.to_dict() for guest in guests]
+        data = request.get_json(silent=True)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[%s] Request Data: %s", request_id, orjson.dumps(data).decode())
+        
+        if not isinstance(data, list) or not data:
+            logger.warning(f"[{request_id}] ✗ Validation failed - Expected a non-empty JSON array")
+            return jsonify({
+                'error': 'Expected a non-empty JSON array of guests'
+            }), 400
+        
+        if len(data) > BULK_MAX_GUESTS:
+            logger.warning(f"[{request_id}] ✗ Validation failed - Too many guests: {len(data)}")
+            return jsonify({
+                'error': f'Too many guests in one request (max {BULK_MAX_GUESTS})'
+            }), 400
+        
+        # Validate every guest before touching the database
+        guests_data = []
+        for index, item in enumerate(data):
+            if not isinstance(item, dict):
+                logger.warning(f"[{request_id}] ✗ Validation failed - Guest {index} is not an object")
+                return jsonify({
+                    'error': 'Each guest must be a JSON object',
+                    'index': index
+                }), 400
+            missing_field = find_missing_field(item)
+            if missing_field:
+                logger.warning(f"[{request_id}] ✗ Validation failed - Guest {index} missing field: {missing_field}")
+                return jsonify({
+                    'error': f'Missing required field: {missing_field}',
+                    'index': index
+                }), 400
+            invalid_field = find_invalid_number_field(item)
+            if invalid_field:
+                logger.warning(f"[{request_id}] ✗ Validation failed - Guest {index} invalid field: {invalid_field}")
+                return jsonify({
+                    'error': f'Invalid integer field: {invalid_field}',
+                    'index': index
+                }), 400
+            guests_data.append(build_guest_data(item))
         
-        logger.info(f"[{request_id}] Found {len(guests_payload)} guests in database")
+        logger.info(f"[{request_id}] Guests: {len(guests_data)}")
         
-        logger.info(f"[{request_id}] ✓ Successfully returned {len(guests)} guests")
+        # Apply the same duplicate rules as the single-guest endpoint (one query for the batch)
+        skipped = []
+        new_guests_data = []
+        accepted_names = []
+        for index, (guest_data, existing_guest) in enumerate(zip(guests_data, find_duplicate_guests(guests_data))):
+            if existing_guest.id is not None:
+                logger.warning(f"[{request_id}] ✗ DUPLICATE DETECTED - Skipping {guest_data['nombre']} {guest_data['apellidos']} (existing ID: {existing_guest.id})")
+                skipped.append({'index': index, 'nombre': guest_data['nombre'], 'apellidos': guest_data['apellidos']})
+                continue
+            
+            # Same rules against the guests already accepted from this request,
+            # using the normalized names computed by the database
+            if any(
+                existing_guest.nombre_normalized == accepted.nombre_normalized
+                and last_names_partially_match(existing_guest.apellidos_normalized, accepted.apellidos_normalized)
+                for accepted in accepted_names
+            ):
+                logger.warning(f"[{request_id}] ✗ DUPLICATE DETECTED (same request) - Skipping {guest_data['nombre']} {guest_data['apellidos']}")
+                skipped.append({'index': index, 'nombre': guest_data['nombre'], 'apellidos': guest_data['apellidos']})
+                continue
+            
+            accepted_names.append(existing_guest)
+            new_guests_data.append((index, guest_data))
+        
+        created = []
+        if new_guests_data:
+            # ON CONFLICT DO NOTHING so a concurrent duplicate is skipped
+            # instead of aborting the whole INSERT
+            inserted_rows = db.session.execute(
+                pg_insert(Guest)
+                .values([guest_data for _, guest_data in new_guests_data])
+                .on_conflict_do_nothing(index_elements=[Guest.nombre_normalized, Guest.apellidos_normalized])
+                .returning(Guest.id, Guest.nombre, Guest.apellidos, Guest.created_at)
+            ).all()
+            db.session.commit()
+            
+            inserted = {(row.nombre, row.apellidos): row for row in inserted_rows}
+            for index, guest_data in new_guests_data:
+                row = inserted.pop((guest_data['nombre'], guest_data['apellidos']), None)
+                if row:
+                    created.append((guest_data, row))
+                else:
+                    logger.warning(f"[{request_id}] ✗ DUPLICATE DETECTED (db constraint) - Skipping {guest_data['nombre']} {guest_data['apellidos']}")
+                    skipped.append({'index': index, 'nombre': guest_data['nombre'], 'apellidos': guest_data['apellidos']})
+        
+        logger.info(f"[{request_id}] ✓ {len(created)} guests saved to database, {len(skipped)} skipped as duplicates")
+        
+        if created:
+            # Add to Google Sheets asynchronously in a single call (non-blocking)
+            enqueue_google_sheets_batch_sync([guest_data for guest_data, _ in created])
+        
+        response_data = {
+            'success': bool(created),
+            'guests': [
+                {
+                    'id': row.id,
+                    'nombre': row.nombre,
+                    'apellidos': row.apellidos,
+                    'created_at': row.created_at
+                }
+                for _, row in created
+            ],
+            'skipped': skipped,
+            'synced_to_sheets': 'pending' if created else False
+        }
+        if created:
+            response_data['message'] = '¡Confirmación recibida con éxito!'
+        else:
+            response_data['error'] = 'Estos nombres ya han sido registrados. Si necesitas actualizar tu confirmación, por favor contacta con los novios.'
+        
+        logger.info(f"[{request_id}] ========================================")
+        
+        return jsonify(response_data), 201 if created else 409
         
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"[{request_id}] ✗ EXCEPTION - Error creating guests: {str(e)}", exc_info=True)
+        logger.info(f"[{request_id}] ========================================")
         return jsonify({
-            'success': True,
-            'count': len(guests_payload),
-            'guests': guests_payload
-        }), 200
+            'error': 'Error al procesar la confirmación. Por favor, inténtalo de nuevo.'
+        }), 500
+
+@app.route('/api/guests', methods=['GET'])
+@limiter.limit("30 per minute")
+def get_guests():
+    """Get all guests (optional endpoint for admin purposes)"""
+    request_id = g.request_id
+    logger.info(f"[{request_id}] GET /api/guests - Fetching all guests")
+    logger.debug("[%s] Remote Address: %s", request_id, request.remote_addr)
+    
+    try:
+        # Run the query up front so DB errors still produce a 500, then stream
+        # rows in batches instead of materializing the whole table in memory.
+        # Read-only path: plain Core rows, no ORM objects per guest
+        guests_table = Guest.__table__
+        guests = db.session.execute(
+            select(
+                guests_table,
+                Guest.nombre_normalized.label('nombre_normalized'),
+                Guest.apellidos_normalized.label('apellidos_normalized')
+            )
+            .order_by(guests_table.c.created_at.desc())
+            .execution_options(yield_per=500)
+        ).mappings()
+
+        def generate():
+            count = 0
+            yield '{"success":true,"guests":['
+            try:
+                for guest in guests:
+                    yield (',' if count else '') + orjson.dumps(dict(guest)).decode()
+                    count += 1
+            except Exception as e:
+                # Headers are already sent, so the client only sees a truncated body
+                logger.error(f"[{request_id}] ✗ Error streaming guests after {count} rows: {str(e)}", exc_info=True)
+                raise
+            yield f'],"count":{count}}}'
+            logger.info(f"[{request_id}] ✓ Successfully returned {count} guests")
+
+        return Response(stream_with_context(generate()), status=200, mimetype='application/json')
         
     except Exception as e:
         logger.error(f"[{request_id}] ✗ Error fetching guests: {str(e)}", exc_info=True)
@@ -360,11 +744,13 @@ if __name__ == '__main__':
     logger.info(f"Database URL: {DATABASE_URL[:50]}..." if DATABASE_URL else "Database URL: NOT SET")
     logger.info(f"Google Apps Script: {'CONFIGURED' if GOOGLE_APPS_SCRIPT_URL else 'NOT CONFIGURED'}")
     
-    # Apply database migrations on startup
-    run_migrations_on_startup()
-    
-    port = int(os.environ.get('PORT', 5000))
-    logger.info(f"Starting server on 0.0.0.0:{port}")
-    logger.info("=" * 80)
-    
-    app.run(host='0.0.0.0', port=port, debug=False)
+    # The Werkzeug server is for local development only; production runs
+    # under gunicorn (see gunicorn_conf.py)
+    if os.environ.get('FLASK_ENV') == 'development':
+        port = int(os.environ.get('PORT', 5000))
+        logger.info(f"Starting development server on 0.0.0.0:{port}")
+        logger.info("=" * 80)
+
+        app.run(host='0.0.0.0', port=port, debug=False)
+    else:
+        logger.warning("FLASK_ENV is not 'development' - start the API with: gunicorn -c gunicorn_conf.py app:app")
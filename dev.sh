@@ -48,6 +48,11 @@ done
 echo "✅ PostgreSQL is ready!"
 echo ""
 
+# Apply database migrations (the API no longer runs them on startup)
+echo "🗄️  Applying database migrations..."
+python manage.py migrate
+echo ""
+
 # Start the Flask application
 PORT=${PORT:-5001}
 echo "🌐 Starting Flask server on http://localhost:$PORT"
@@ -58,4 +63,4 @@ echo "To stop PostgreSQL: docker-compose down"
 echo "============================================"
 echo ""
 
-python app.py
+FLASK_ENV=development RATELIMIT_ENABLED=false python app.py
@@ -0,0 +1,21 @@
+"""Gunicorn configuration for the Wedding RSVP API
+
+Usage: gunicorn -c gunicorn_conf.py app:app
+"""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Threaded workers so slow requests don't block the whole process.
+# Not derived from the CPU count: containers report the host's cores. Each
+# worker has its own DB pool (up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections),
+# so keep WEB_CONCURRENCY * that total under Postgres max_connections (100 by
+# default). Each worker also has its own rate limit counters unless
+# RATELIMIT_STORAGE_URI points at a shared store such as Redis.
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+# Keep threads at or below DB_POOL_SIZE to avoid waiting on connections
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+worker_class = 'gthread'
+
+# Import the app once in the master and share it with workers via fork
+preload_app = True
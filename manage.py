@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Management commands for the Wedding RSVP API
+Run once per deploy (release phase), before starting the web workers
+
+Usage: python manage.py migrate
+"""
+import sys
+
+from flask_migrate import upgrade as migrate_upgrade
+
+from app import app, logger, DATABASE_URL
+
+def migrate():
+    """Apply pending database migrations"""
+    if not DATABASE_URL:
+        logger.warning("⚠️  DATABASE_URL not set - cannot run migrations")
+        return 1
+
+    try:
+        with app.app_context():
+            logger.info("Running database migrations...")
+            migrate_upgrade()
+            logger.info("✓ Database migrations applied")
+        return 0
+    except Exception as e:
+        logger.error(f"✗ Failed to run database migrations: {str(e)}", exc_info=True)
+        return 1
+
+COMMANDS = {
+    'migrate': migrate,
+}
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2 or sys.argv[1] not in COMMANDS:
+        print(f"Usage: python manage.py [{'|'.join(COMMANDS)}]")
+        sys.exit(2)
+
+    sys.exit(COMMANDS[sys.argv[1]]())
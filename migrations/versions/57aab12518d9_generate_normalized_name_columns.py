@@ -0,0 +1,62 @@
+"""Generate normalized name columns in the database
+
+Revision ID: 57aab12518d9
+Revises: 47d1f2d884df
+Create Date: 2026-10-15 11:55:02.481337
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '57aab12518d9'
+down_revision = '47d1f2d884df'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+    # unaccent() is only STABLE; generated columns need an IMMUTABLE expression,
+    # so pin the dictionary explicitly in a wrapper function
+    op.execute("""
+        CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text AS $$
+            SELECT public.unaccent('public.unaccent'::regdictionary, $1)
+        $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    """)
+
+    # Existing columns cannot be converted in place, so drop and re-add them
+    with op.batch_alter_table('guests', schema=None) as batch_op:
+        batch_op.drop_index('ix_guests_apellidos_pattern')
+        batch_op.drop_constraint('uix_guests_normalized_names', type_='unique')
+        batch_op.drop_column('nombre_normalized')
+        batch_op.drop_column('apellidos_normalized')
+
+    with op.batch_alter_table('guests', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('nombre_normalized', sa.String(length=255), sa.Computed('lower(immutable_unaccent(trim(nombre)))', persisted=True), nullable=True))
+        batch_op.add_column(sa.Column('apellidos_normalized', sa.String(length=255), sa.Computed('lower(immutable_unaccent(trim(apellidos)))', persisted=True), nullable=True))
+        batch_op.create_unique_constraint('uix_guests_normalized_names', ['nombre_normalized', 'apellidos_normalized'])
+        batch_op.create_index('ix_guests_apellidos_pattern', ['apellidos_normalized'], unique=False, postgresql_ops={'apellidos_normalized': 'varchar_pattern_ops'})
+
+
+def downgrade():
+    with op.batch_alter_table('guests', schema=None) as batch_op:
+        batch_op.drop_index('ix_guests_apellidos_pattern')
+        batch_op.drop_constraint('uix_guests_normalized_names', type_='unique')
+        batch_op.drop_column('apellidos_normalized')
+        batch_op.drop_column('nombre_normalized')
+
+    with op.batch_alter_table('guests', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('nombre_normalized', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('apellidos_normalized', sa.String(length=255), nullable=True))
+
+    op.execute('UPDATE guests SET nombre_normalized = lower(immutable_unaccent(trim(nombre))), apellidos_normalized = lower(immutable_unaccent(trim(apellidos)))')
+
+    with op.batch_alter_table('guests', schema=None) as batch_op:
+        batch_op.alter_column('nombre_normalized', existing_type=sa.String(length=255), nullable=False)
+        batch_op.alter_column('apellidos_normalized', existing_type=sa.String(length=255), nullable=False)
+        batch_op.create_unique_constraint('uix_guests_normalized_names', ['nombre_normalized', 'apellidos_normalized'])
+        batch_op.create_index('ix_guests_apellidos_pattern', ['apellidos_normalized'], unique=False, postgresql_ops={'apellidos_normalized': 'varchar_pattern_ops'})
+
+    op.execute('DROP FUNCTION IF EXISTS immutable_unaccent(text)')
@@ -0,0 +1,45 @@
+"""Replace normalized name columns with expression indexes
+
+Revision ID: 5d11f8c0fe6e
+Revises: 57aab12518d9
+Create Date: 2026-10-15 11:58:12.903517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d11f8c0fe6e'
+down_revision = '57aab12518d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # unaccent and immutable_unaccent() are created by 57aab12518d9
+    with op.batch_alter_table('guests', schema=None) as batch_op:
+        batch_op.drop_index('ix_guests_apellidos_pattern')
+        batch_op.drop_constraint('uix_guests_normalized_names', type_='unique')
+        batch_op.drop_column('apellidos_normalized')
+        batch_op.drop_column('nombre_normalized')
+
+    op.execute(
+        'CREATE UNIQUE INDEX uix_guests_normalized_names ON guests '
+        '(lower(immutable_unaccent(trim(nombre))), lower(immutable_unaccent(trim(apellidos))))'
+    )
+    op.execute(
+        'CREATE INDEX ix_guests_apellidos_pattern ON guests '
+        '(lower(immutable_unaccent(trim(apellidos))) text_pattern_ops)'
+    )
+
+
+def downgrade():
+    op.drop_index('ix_guests_apellidos_pattern', table_name='guests')
+    op.drop_index('uix_guests_normalized_names', table_name='guests')
+
+    with op.batch_alter_table('guests', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('nombre_normalized', sa.String(length=255), sa.Computed('lower(immutable_unaccent(trim(nombre)))', persisted=True), nullable=True))
+        batch_op.add_column(sa.Column('apellidos_normalized', sa.String(length=255), sa.Computed('lower(immutable_unaccent(trim(apellidos)))', persisted=True), nullable=True))
+        batch_op.create_unique_constraint('uix_guests_normalized_names', ['nombre_normalized', 'apellidos_normalized'])
+        batch_op.create_index('ix_guests_apellidos_pattern', ['apellidos_normalized'], unique=False, postgresql_ops={'apellidos_normalized': 'varchar_pattern_ops'})
@@ -145,6 +145,68 @@ def test_similar_but_different_name():
     print_response(response)
     return response.status_code == 201
 
+def test_bulk_create():
+    """Test creating several guests at once"""
+    print("\n✅ Testing Bulk Create (duplicate within the batch is skipped)...")
+    guests_data = [
+        {
+            "nombre": "Lucía",
+            "apellidos": "Bulk Test",
+            "asistencia": "si",
+            "acompanado": "no",
+            "autobus": "no"
+        },
+        {
+            "nombre": "Pablo",
+            "apellidos": "Bulk Test",
+            "asistencia": "si",
+            "acompanado": "no",
+            "autobus": "ida"
+        },
+        {
+            "nombre": "LUCIA",
+            "apellidos": "Bulk",  # Partial match of the first guest
+            "asistencia": "si",
+            "acompanado": "no",
+            "autobus": "no"
+        }
+    ]
+
+    response = requests.post(
+        f"{BASE_URL}/api/guests/bulk",
+        json=guests_data
+    )
+    print_response(response)
+    created = (
+        response.status_code == 201
+        and len(response.json()['guests']) == 2
+        and [guest['index'] for guest in response.json()['skipped']] == [2]
+    )
+
+    print("\n❌ Testing Bulk Create with All Duplicates (Should Fail)...")
+    response = requests.post(
+        f"{BASE_URL}/api/guests/bulk",
+        json=guests_data[:2]
+    )
+    print_response(response)
+    all_duplicates = (
+        response.status_code == 409
+        and len(response.json()['skipped']) == 2
+    )
+
+    print("\n❌ Testing Bulk Create with Missing Fields (Should Fail)...")
+    response = requests.post(
+        f"{BASE_URL}/api/guests/bulk",
+        json=[guests_data[0], {"nombre": "Test User"}]
+    )
+    print_response(response)
+    invalid = (
+        response.status_code == 400
+        and response.json().get('index') == 1
+    )
+
+    return created and all_duplicates and invalid
+
 def run_all_tests():
     """Run all tests"""
     print("=" * 80)
@@ -159,6 +221,7 @@ def run_all_tests():
         ("Similar But Different Name", test_similar_but_different_name),
         ("Missing Fields", test_missing_fields),
         ("Guest Without Companions", test_guest_without_companions),
+        ("Bulk Create", test_bulk_create),
         ("Get All Guests", test_get_guests),
     ]
     
@@ -192,4 +255,4 @@ if __name__ == "__main__":
     except requests.exceptions.ConnectionError:
         print("\n❌ Error: Could not connect to the server.")
         print(f"Make sure the server is running at {BASE_URL}")
-        print("\nStart the server with: python app.py")
+        print("\nStart the server with: ./dev.sh")